@@ -1,11 +1,11 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import core.scraper as scraper
 import core.analyzer as analyzer
-import core.processor as processor
 import core.pdf_generator as pdf_generator
+import core.pipeline as pipeline
+import core.charts as charts
 from urllib.parse import urlparse
-import re
+import functools
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -85,9 +85,13 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # --- Logic: Analysis Pipeline ---
-@st.cache_data(show_spinner=False)
-def run_analysis(base_url, target_lang):
-    """The main function to run the complete analysis pipeline."""
+# Finished analyses are cached in core.result_cache, which every app process
+# shares, so this only runs on a cache miss.
+def run_analysis(base_url):
+    """
+    Runs the fast stages of the pipeline (find, extract, classify).
+    Summarization and translation are started separately as a background job.
+    """
     results = {}
     
     # Step 1: Find and Scrape
@@ -119,95 +123,74 @@ def run_analysis(base_url, target_lang):
         results['overall_risk'] = overall_risk
         results['highlights'] = highlights
 
-    # Step 4: Summarize
-    with st.spinner("📝 Generating executive summary..."):
-        summary_en = processor.summarize_text(full_text)
-        results['summary'] = summary_en
-
-    # Step 5: Translate
-    lang_name = target_lang.capitalize()
-    with st.spinner(f"🌐 Translating to {lang_name}..."):
-        summary_translated = processor.translate_text(summary_en, target_lang)
-        results['translated_summary'] = summary_translated
-        results['language'] = target_lang
-
+    # Steps 4 & 5 (Summarize, Translate) run in the background, see start_background_job
     return results
 
-def count_sentences(text):
-    """Estimate sentence count to calculate low risk portion."""
-    # Using the same regex logic as analyzer.py
-    sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', text)
-    # Filter tiny sentences
-    sentences = [s.strip() for s in sentences if len(s.split()) > 5]
-    return len(sentences)
+def cancel_background_job():
+    job = st.session_state.get('job')
+    if job is not None:
+        job.cancel()
+    st.session_state['job'] = None
 
-def calculate_counts(highlights, full_text):
-    """Helper to calculate counts for logic and chart."""
-    total_sentences = count_sentences(full_text)
-    high_count = sum(1 for h in highlights if "[HIGH RISK]" in h)
-    medium_count = sum(1 for h in highlights if "[MEDIUM RISK]" in h)
-    
-    # Estimate Low Risk
-    low_count = max(0, total_sentences - high_count - medium_count)
-    return high_count, medium_count, low_count
+def start_background_job(results, languages, domain):
+    """Starts summarization and translation, cancelling any job that is still running."""
+    cancel_background_job()
+    st.session_state['job'] = pipeline.AnalysisJob(
+        results, languages, domain=domain, cache_key=pipeline.cache_key(domain, languages)
+    )
 
-def create_pie_chart(high_count, medium_count, low_count):
-    """Generates a Matplotlib pie chart using pre-calculated counts."""
-    
-    # Prepare Data
-    labels = ['High Risk', 'Medium Risk', 'Low Risk (Safe)']
-    sizes = [high_count, medium_count, low_count]
-    colors = ['#ef4444', '#f59e0b', '#22c55e'] # Red, Amber, Green
+def render_summary_tabs():
+    """Fills the summary tabs in, polling the background job while it runs."""
+    results = st.session_state['results']
+    job = st.session_state.get('job')
 
-    # Filter out zero values
-    final_labels = []
-    final_sizes = []
-    final_colors = []
-    for l, s, c in zip(labels, sizes, colors):
-        if s > 0:
-            final_labels.append(l)
-            final_sizes.append(s)
-            final_colors.append(c)
-            
-    if not final_sizes:
-        return None
+    # Once the job has finished, merge its output and redraw the whole page (PDF export etc.)
+    if job is not None and job.done:
+        job.apply_to(results)
+        st.session_state['job'] = None
+        if job.error:
+            results['summary_error'] = job.error  # Shown in the tabs after the rerun
+        st.rerun()
 
-    # Identify the "Main Prediction" (Largest Slice)
-    max_val = max(final_sizes)
-    max_idx = final_sizes.index(max_val)
-    
-    # Create Explode array (Pop out the largest slice)
-    explode = [0.1 if i == max_idx else 0 for i in range(len(final_sizes))]
+    languages = job.languages if job else results.get('languages', [])
+    summary = results.get('summary') or (job.summary if job else None)
+    translations = results.get('translations') or (job.translations if job else {})
 
-    # Create Plot
-    fig, ax = plt.subplots(figsize=(5, 5))
-    fig.patch.set_alpha(0) # Transparent background
+    tabs = st.tabs(["English"] + [lang.capitalize() for lang in languages])
     
-    wedges, texts, autotexts = ax.pie(
-        final_sizes, 
-        labels=final_labels, 
-        autopct='%1.1f%%', 
-        startangle=90, 
-        colors=final_colors,
-        explode=explode, 
-        textprops={'fontsize': 10, 'color': '#333'},
-        wedgeprops={'edgecolor': 'white', 'linewidth': 1}
-    )
-    
-    # Apply Fade Effect
-    for i, wedge in enumerate(wedges):
-        if i == max_idx:
-            wedge.set_alpha(1.0) # Full brightness
+    with tabs[0]:
+        st.markdown(f"*English Summary:*")
+        if summary:
+            st.write(summary)
+        elif job is not None:
+            st.info("📝 Generating executive summary...")
+        elif 'summary_error' in results:
+            st.error(f"Summary generation failed: {results['summary_error']}")
         else:
-            wedge.set_alpha(0.3) # Faded
+            st.info("Summary was cancelled.")
     
-    # Style percentage text
-    for autotext in autotexts:
-        autotext.set_color('white')
-        autotext.set_weight('bold')
+    for tab, lang in zip(tabs[1:], languages):
+        lang_name = lang.capitalize()
+        with tab:
+            st.markdown(f"{lang_name} Summary:")
+            if lang in translations:
+                st.write(translations[lang])
+            elif job is not None:
+                st.info(f"🌐 Translating to {lang_name}...")
+            else:
+                st.info("Translation was cancelled.")
 
-    ax.axis('equal')
-    return fig
+    tm_metrics = results.get('metrics', {}).get('translation_memory')
+    if tm_metrics and tm_metrics['hits'] + tm_metrics['misses'] > 0:
+        st.caption(
+            f"Translation memory: {tm_metrics['hits']} of {tm_metrics['hits'] + tm_metrics['misses']} "
+            f"sentences reused ({tm_metrics['hit_rate']:.0%}), ~{tm_metrics['time_saved_s']:.1f}s saved"
+        )
+
+    if job is not None:
+        if st.button("Cancel", key="cancel_job"):
+            job.cancel()
+            st.rerun()
 
 # --- Sidebar: Configuration ---
 with st.sidebar:
@@ -223,9 +206,11 @@ with st.sidebar:
         help="Enter the domain name (e.g. google.com)"
     )
     
-    lang_input = st.selectbox(
-        "Report Language",
-        ('Bengali', 'Hindi', 'Tamil', 'French', 'Russian')
+    lang_input = st.multiselect(
+        "Report Languages",
+        ('Bengali', 'Hindi', 'Tamil', 'French', 'Russian'),
+        default=['Bengali'],
+        help="The summary is translated into every selected language in parallel"
     )
     
     st.markdown("---")
@@ -244,19 +229,36 @@ if not analyze_btn and 'results' not in st.session_state:
 
 else:
     # Check if we need to run or if we have cached results in session state
+    domain = urlparse(url_input).netloc
+    if not domain:
+        domain = urlparse(f"https://{url_input}").netloc
+
     if analyze_btn:
-        domain = urlparse(url_input).netloc
-        if not domain:
-            domain = urlparse(f"https://{url_input}").netloc
-        
-        results = run_analysis(domain, lang_input.lower())
+        languages = [lang.lower() for lang in lang_input]
+        results = pipeline.lookup_cached(domain, languages)
+        if results is not None:
+            cancel_background_job()
+            if results['metrics']['result_cache'] == 'stale':
+                st.toast("Showing a cached report while a fresh one is prepared in the background")
+        else:
+            results = run_analysis(domain)
+            if results:
+                results['languages'] = languages
+                start_background_job(results, languages, domain)
         st.session_state['results'] = results # Save to session state
     
+    # Stop background work for a domain the user has moved away from
+    job = st.session_state.get('job')
+    if job is not None and not job.done and job.domain != domain:
+        job.cancel()
+        st.session_state['job'] = None
+        st.toast(f"Cancelled the background summary for {job.domain}")
+
     results = st.session_state.get('results')
 
     if results:
         # --- Calculate Counts First ---
-        h_count, m_count, l_count = calculate_counts(results['highlights'], results['full_text'])
+        h_count, m_count, l_count = charts.calculate_counts(results['highlights'], results['full_text'])
         
         # --- Logic Fix: Determine Dominant Risk for Banner ---
         # The banner will now reflect whichever category is largest
@@ -281,36 +283,32 @@ else:
         
         with col1:
             st.subheader("Risk Distribution")
-            fig = create_pie_chart(h_count, m_count, l_count)
-            if fig:
-                st.pyplot(fig)
+            chart_png = charts.render_pie_chart(h_count, m_count, l_count)
+            if chart_png:
+                st.image(chart_png)
             else:
                 st.info("Insufficient data for chart.")
             
-            # PDF Download
+            # PDF Download (needs the summary from the background job)
             st.markdown("### Export")
-            with st.spinner("Generating Report..."):
-                pdf_data = pdf_generator.create_report(results)
-            st.download_button(
-                label="📄 Download PDF Report",
-                data=pdf_data,
-                file_name=f"PolicyGuard_{url_input}.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+            if 'summary' in results and len(results.get('translations', {})) == len(results['languages']):
+                # Rendered only when the button is clicked (and cached by content hash)
+                st.download_button(
+                    label="📄 Download PDF Report",
+                    data=functools.partial(pdf_generator.create_report, results),
+                    file_name=f"PolicyGuard_{url_input}.pdf",
+                    mime="application/pdf",
+                    use_container_width=True
+                )
+            else:
+                st.caption("The PDF report will be available once the summary is ready.")
 
         with col2:
             st.subheader("Executive Summary")
-            
-            tab1, tab2 = st.tabs(["English", lang_input])
-            
-            with tab1:
-                st.markdown(f"*English Summary:*")
-                st.write(results['summary'])
-            
-            with tab2:
-                st.markdown(f"{lang_input} Summary:")
-                st.write(results['translated_summary'])
+
+            # Poll once a second while the background job runs, then stop
+            poll_interval = 1.0 if st.session_state.get('job') is not None else None
+            st.fragment(run_every=poll_interval)(render_summary_tabs)()
 
         st.divider()
 
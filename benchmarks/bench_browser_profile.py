@@ -0,0 +1,88 @@
+"""
+Compares page loads with a stock Chrome against the lean scraper profile.
+
+Serves the local fixture site, loads its policy page several times with each
+profile and reports page-load time, bytes transferred and Chrome memory.
+
+Usage:
+    python benchmarks/bench_browser_profile.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import core.scraper as scraper
+import core.browser_profile as browser_profile
+from core.procstats import tree_memory, format_bytes
+from fixture_site import FixtureSite, THIRD_PARTY_HOST
+
+
+def measure_load(profile, url, site):
+    """Loads `url` once in a fresh browser and returns the measurements."""
+    driver = scraper.get_selenium_driver(profile)
+    if driver is None:
+        raise RuntimeError("Could not start Chrome")
+
+    try:
+        site.reset_counters()
+        start = time.perf_counter()
+        driver.get(url)  # Returns after the load event
+        wall_time = time.perf_counter() - start
+        nav_time = driver.execute_script(
+            "const t = performance.timing; return t.loadEventEnd - t.navigationStart;"
+        )
+        time.sleep(1)  # Let late requests (video, iframes) land before sampling
+        memory = tree_memory(driver.service.process.pid, include_self=False)
+        return {
+            'wall_s': wall_time,
+            'load_ms': nav_time,
+            'bytes': site.bytes_sent,
+            'requests': site.requests,
+            'chrome_rss': memory['rss'],
+            'chrome_pss': memory['pss'],
+        }
+    finally:
+        driver.quit()
+
+
+def summarize(samples):
+    keys = samples[0].keys()
+    return {key: statistics.median(s[key] for s in samples) for key in keys}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='page loads per profile')
+    parser.add_argument('--sentences', type=int, default=300, help='policy sentences on the page')
+    args = parser.parse_args()
+
+    site = FixtureSite(sentence_count=args.sentences).start()
+    url = f"{site.base_url}/privacy"
+
+    # The fixture's "third-party" host stands in for real ad/analytics hosts
+    lean = dict(browser_profile.LEAN_PROFILE)
+    lean['blocked_hosts'] = browser_profile.BLOCKED_HOSTS + [THIRD_PARTY_HOST]
+    profiles = {'stock': None, 'lean': lean}
+
+    results = {}
+    try:
+        for name, profile in profiles.items():
+            measure_load(profile, url, site)  # Warm-up (driver download, disk cache)
+            samples = [measure_load(profile, url, site) for _ in range(args.runs)]
+            results[name] = summarize(samples)
+    finally:
+        site.stop()
+
+    print(f"\nMedian of {args.runs} loads of {url}")
+    print(f"{'profile':<8} {'load ms':>9} {'wall s':>8} {'requests':>9} {'transferred':>12} {'chrome RSS':>11} {'chrome PSS':>11}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['load_ms']:>9.0f} {r['wall_s']:>8.2f} {r['requests']:>9.0f} "
+              f"{format_bytes(r['bytes']):>12} {format_bytes(r['chrome_rss']):>11} {format_bytes(r['chrome_pss']):>11}")
+
+
+if __name__ == "__main__":
+    main()
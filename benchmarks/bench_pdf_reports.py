@@ -0,0 +1,85 @@
+"""
+Measures per-report PDF latency and batch throughput.
+
+Builds synthetic analysis results from the training sentences, then times
+a cold render (font parse included), warm renders, cache hits and a batch
+rendered in a process pool.
+
+Usage:
+    python benchmarks/bench_pdf_reports.py --reports 200 --workers 4
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import core.pdf_generator as pdf_generator
+from fixture_site import load_sentences
+
+
+def make_results(sentences, rng, index):
+    """Returns a results dict shaped like the pipeline output."""
+    highlights = [f"[{rng.choice(['HIGH', 'MEDIUM'])} RISK] {s}" for s in rng.sample(sentences, 15)]
+    return {
+        'url': f"https://example{index}.com/privacy",
+        'overall_risk': rng.choice(['High Risk', 'Medium Risk', 'Safe']),
+        'summary': ' '.join(rng.sample(sentences, 8)),
+        'languages': ['bengali'],
+        'translations': {'bengali': ' '.join(rng.sample(sentences, 8))},
+        'highlights': highlights,
+    }
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reports', type=int, default=100, help='number of distinct reports')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='batch process pool size')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sentences = load_sentences()
+    reports = [make_results(sentences, rng, i) for i in range(args.reports)]
+
+    # Cold: includes parsing the font
+    start = time.perf_counter()
+    pdf_generator.render_report(reports[0])
+    cold = time.perf_counter() - start
+
+    # Warm: font already parsed, every report distinct
+    warm = []
+    for report in reports:
+        start = time.perf_counter()
+        pdf_generator.render_report(report)
+        warm.append(time.perf_counter() - start)
+
+    # Cache hits: what a Streamlit rerun pays for an unchanged report
+    pdf_generator.create_report(reports[0])
+    hits = []
+    for _ in range(args.reports):
+        start = time.perf_counter()
+        pdf_generator.create_report(reports[0])
+        hits.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pdf_generator.create_reports(reports, max_workers=args.workers)
+    batch = time.perf_counter() - start
+
+    print(f"\n{args.reports} reports")
+    print(f"cold render (font parse):  {cold * 1000:8.1f} ms")
+    print(f"warm render p50 / p95:     {statistics.median(warm) * 1000:8.1f} / {percentile(warm, 95) * 1000:.1f} ms")
+    print(f"cache hit p50:             {statistics.median(hits) * 1000:8.3f} ms")
+    print(f"sequential throughput:     {args.reports / sum(warm):8.1f} reports/s")
+    print(f"batch ({args.workers} processes):     {args.reports / batch:8.1f} reports/s ({batch:.2f} s total)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import csv
+import os
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A small local website that looks like a typical company homepage and
+# policy page: real policy sentences plus the heavy resources (images,
+# fonts, video, ad scripts, third-party iframes) we never actually read.
+DATASET_FILE = os.path.join(os.path.dirname(__file__), '..', 'training', 'policies_dataset.csv')
+
+# Pages reference "third-party" resources through this host, while the
+# site itself is served from 127.0.0.1, so a host blocklist can be tested.
+THIRD_PARTY_HOST = 'localhost'
+
+IMAGE_COUNT = 12
+IMAGE_SIZE = 200 * 1024
+FONT_SIZE = 150 * 1024
+VIDEO_SIZE = 2 * 1024 * 1024
+SCRIPT_SIZE = 80 * 1024
+
+
+def load_sentences():
+    """Loads the policy sentences used to fill the fixture pages."""
+    with open(DATASET_FILE, newline='', encoding='utf-8') as f:
+        return [row['text'] for row in csv.DictReader(f) if row.get('text')]
+
+
+def _blob(size, seed):
+    return random.Random(seed).randbytes(size)
+
+
+class FixtureSite:
+    """Serves the fixture pages on a background thread and counts bytes sent."""
+
+    def __init__(self, sentence_count=300, seed=0):
+        sentences = load_sentences()
+        rng = random.Random(seed)
+        self.policy_text = [rng.choice(sentences) for _ in range(sentence_count)]
+        self.bytes_sent = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._assets = {
+            '/static/font.woff2': ('font/woff2', _blob(FONT_SIZE, 1)),
+            '/static/clip.mp4': ('video/mp4', _blob(VIDEO_SIZE, 2)),
+            '/ads/track.js': ('application/javascript', b'//' + b'x' * SCRIPT_SIZE),
+            '/ads/frame.html': ('text/html', b'<html><body>' + b'ad ' * 20000 + b'</body></html>'),
+        }
+        for i in range(IMAGE_COUNT):
+            self._assets[f'/static/img{i}.jpg'] = ('image/jpeg', _blob(IMAGE_SIZE, 100 + i))
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def third_party_url(self):
+        port = self._server.server_address[1]
+        return f"http://{THIRD_PARTY_HOST}:{port}"
+
+    def reset_counters(self):
+        with self._lock:
+            self.bytes_sent = 0
+            self.requests = 0
+
+    def _heavy_resources(self):
+        third_party = self.third_party_url
+        parts = [
+            "<style>@font-face { font-family: Brand; src: url('/static/font.woff2'); }"
+            " body { font-family: Brand, sans-serif; }</style>",
+            f"<script src='{third_party}/ads/track.js'></script>",
+            "<video src='/static/clip.mp4' autoplay muted preload='auto'></video>",
+            f"<iframe src='{third_party}/ads/frame.html'></iframe>",
+        ]
+        parts += [f"<img src='/static/img{i}.jpg' alt='banner'>" for i in range(IMAGE_COUNT)]
+        return '\n'.join(parts)
+
+    def render_home(self):
+        return f"""<html><head><title>Fixture Corp</title></head><body>
+<header><nav><a href='/blog'>Blog</a></nav></header>
+<main><h1>Welcome to Fixture Corp</h1>{self._heavy_resources()}</main>
+<footer><a href='/privacy'>Privacy Policy</a> <a href='/terms'>Terms of Service</a></footer>
+</body></html>"""
+
+    def render_policy(self, title):
+        paragraphs = '\n'.join(f"<p>{s}</p>" for s in self.policy_text)
+        return f"""<html><head><title>{title}</title></head><body>
+<header><nav><a href='/'>Home</a></nav></header>
+<main><h1>{title}</h1>{self._heavy_resources()}
+{paragraphs}</main>
+<footer><a href='/privacy'>Privacy Policy</a></footer>
+</body></html>"""
+
+    def resolve(self, path):
+        """Returns (content_type, body) for a request path, or None for a 404."""
+        path = path.split('?')[0]
+        if path == '/':
+            return 'text/html', self.render_home().encode('utf-8')
+        if path == '/privacy':
+            return 'text/html', self.render_policy('Privacy Policy').encode('utf-8')
+        if path == '/terms':
+            return 'text/html', self.render_policy('Terms of Service').encode('utf-8')
+        return self._assets.get(path)
+
+    def start(self, port=0):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                found = site.resolve(self.path)
+                if found is None:
+                    self.send_error(404)
+                    return
+                content_type, body = found
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                with site._lock:
+                    site.bytes_sent += len(body)
+                    site.requests += 1
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output readable
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
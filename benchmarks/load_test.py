@@ -0,0 +1,284 @@
+"""
+Concurrent-user load test for the full analysis stack.
+
+Simulated users run the complete pipeline (Selenium scrape, risk
+classification, summarization, translation) against the local fixture
+site, the way concurrent Streamlit sessions would inside one app.py
+process. Reports throughput, latency percentiles, error rate, and the
+Chrome process count and memory over time.
+
+Closed loop (N users, each starting a new analysis as soon as one ends):
+    python benchmarks/load_test.py --users 4 --duration 300
+
+Open loop (Poisson arrivals, queued when all N users are busy; arrivals still
+queued at the deadline are dropped and reported separately):
+    python benchmarks/load_test.py --users 8 --rate 0.2 --duration 600 \\
+        --languages "bengali=0.6,french=0.3,hindi+tamil=0.1"
+
+Save a run, then fail later runs that regress against it:
+    python benchmarks/load_test.py --output baseline.json
+    python benchmarks/load_test.py --baseline baseline.json --max-regression 0.2
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import core.scraper as scraper
+import core.pipeline as pipeline
+from core.procstats import descendant_pids, process_cmdline, process_name, read_memory, format_bytes
+from fixture_site import FixtureSite
+
+
+def parse_language_mix(spec):
+    """Parses 'bengali=0.6,hindi+tamil=0.4' into [(['bengali'], 0.6), (['hindi', 'tamil'], 0.4)]."""
+    mix = []
+    for entry in spec.split(','):
+        languages, _, weight = entry.strip().partition('=')
+        mix.append(([lang.strip().lower() for lang in languages.split('+')], float(weight or 1)))
+    return mix
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class LoadTest:
+    def __init__(self, base_url, users, language_mix, use_cache, seed=0):
+        self.base_url = base_url
+        self.users = users
+        self.language_mix = language_mix
+        self.use_cache = use_cache
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.records = []   # (finished_at, latency_s, queued_s, error or None)
+        self.samples = []   # Resource samples over time
+        self.active = 0
+        self.started_at = None
+        self.duration = None
+        self.arrivals = 0   # Open loop only
+        self.dropped = 0    # Arrivals still queued at the deadline, never run
+
+    def pick_languages(self):
+        with self.lock:
+            languages, weights = zip(*self.language_mix)
+            return self.rng.choices(languages, weights=weights)[0]
+
+    def run_one(self, submitted_at):
+        """One user session: a full analysis of the fixture site."""
+        start = time.monotonic()
+        with self.lock:
+            self.active += 1
+
+        error = None
+        try:
+            analyze = pipeline.analyze_domain_cached if self.use_cache else pipeline.analyze_domain
+            results, error = analyze(self.base_url, self.pick_languages())
+            if results is not None and not pipeline.is_cacheable(results):
+                error = "Model error in results"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        end = time.monotonic()
+        with self.lock:
+            self.active -= 1
+            self.records.append((end - self.started_at, end - submitted_at, start - submitted_at, error))
+
+    def sample_resources(self, stop_event, interval):
+        """Records browser count and memory every `interval` seconds until stopped."""
+        me = os.getpid()
+        while not stop_event.is_set():
+            browsers = 0
+            chrome_rss = 0
+            for pid in descendant_pids(me):
+                name = process_name(pid)
+                if 'chrome' in name and 'chromedriver' not in name:
+                    chrome_rss += read_memory(pid)['rss']
+                    # Renderer, GPU and utility processes all carry --type=; the browser itself doesn't
+                    if '--type=' not in process_cmdline(pid):
+                        browsers += 1
+            own = read_memory(me)
+            with self.lock:
+                active = self.active
+                completed = len(self.records)
+            self.samples.append({
+                't': time.monotonic() - self.started_at,
+                'active': active,
+                'completed': completed,
+                'browsers': browsers,
+                'app_rss': own['rss'],
+                'chrome_rss': chrome_rss,
+            })
+            stop_event.wait(interval)
+
+    def run(self, duration, rate, sample_interval):
+        self.started_at = time.monotonic()
+        stop_sampling = threading.Event()
+        sampler = threading.Thread(target=self.sample_resources, args=(stop_sampling, sample_interval), daemon=True)
+        sampler.start()
+
+        self.duration = duration
+        deadline = self.started_at + duration
+        pool = ThreadPoolExecutor(max_workers=self.users, thread_name_prefix='user')
+        futures = []
+        try:
+            if rate > 0:
+                # Open loop: arrivals don't wait for earlier requests to finish
+                while time.monotonic() < deadline:
+                    futures.append(pool.submit(self.run_one, time.monotonic()))
+                    self.arrivals += 1
+                    time.sleep(min(self.rng.expovariate(rate), max(0.0, deadline - time.monotonic())))
+            else:
+                # Closed loop: each user starts a new analysis as soon as one ends
+                def user_loop():
+                    while time.monotonic() < deadline:
+                        self.run_one(time.monotonic())
+                for _ in range(self.users):
+                    pool.submit(user_loop)
+        finally:
+            # Stop admitting at the deadline: the backlog is dropped rather than run
+            # past --duration, analyses already in flight are allowed to finish
+            pool.shutdown(wait=True, cancel_futures=True)
+        self.dropped = sum(1 for future in futures if future.cancelled())
+
+        stop_sampling.set()
+        sampler.join()
+        return time.monotonic() - self.started_at
+
+    def summary(self, elapsed):
+        latencies = [r[1] for r in self.records if r[3] is None]
+        errors = {}
+        for record in self.records:
+            if record[3] is not None:
+                errors[record[3]] = errors.get(record[3], 0) + 1
+        total = len(self.records)
+        # Throughput only counts what finished inside the load window
+        in_window = sum(1 for r in self.records if r[3] is None and r[0] <= self.duration)
+        return {
+            'requests': total,
+            'arrivals': self.arrivals,
+            'dropped': self.dropped,
+            'finished_after_deadline': sum(1 for r in self.records if r[0] > self.duration),
+            'elapsed_s': elapsed,
+            'throughput_per_min': in_window / self.duration * 60 if self.duration else 0.0,
+            'error_rate': (total - len(latencies)) / total if total else 0.0,
+            'errors': errors,
+            'latency_s': {
+                'mean': statistics.mean(latencies) if latencies else 0.0,
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'max': max(latencies) if latencies else 0.0,
+            },
+            'queue_wait_p95_s': percentile([r[2] for r in self.records], 95),
+            'peak_browsers': max((s['browsers'] for s in self.samples), default=0),
+            'peak_app_rss': max((s['app_rss'] for s in self.samples), default=0),
+            'peak_chrome_rss': max((s['chrome_rss'] for s in self.samples), default=0),
+            'samples': self.samples,
+        }
+
+
+def print_report(config, summary):
+    latency = summary['latency_s']
+    print(f"\n=== Load test: {config['users']} users, "
+          f"{'rate ' + str(config['rate']) + '/s' if config['rate'] else 'closed loop'}, "
+          f"{summary['elapsed_s']:.0f}s ===")
+    print(f"requests:     {summary['requests']}  (errors: {summary['error_rate']:.1%}, "
+          f"{summary['finished_after_deadline']} finished after the deadline)")
+    if config['rate']:
+        print(f"arrivals:     {summary['arrivals']}  (dropped, still queued at the deadline: {summary['dropped']})")
+    print(f"throughput:   {summary['throughput_per_min']:.2f} analyses/min")
+    print(f"latency (s):  mean {latency['mean']:.1f}  p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  "
+          f"p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+    print(f"queue wait:   p95 {summary['queue_wait_p95_s']:.1f}s")
+    print(f"peak:         {summary['peak_browsers']} browsers, app RSS {format_bytes(summary['peak_app_rss'])}, "
+          f"Chrome RSS {format_bytes(summary['peak_chrome_rss'])}")
+    for error, count in summary['errors'].items():
+        print(f"  error x{count}: {error}")
+
+    print(f"\n{'t (s)':>7} {'active':>7} {'done':>6} {'browsers':>9} {'app RSS':>10} {'Chrome RSS':>11}")
+    for s in summary['samples']:
+        print(f"{s['t']:>7.0f} {s['active']:>7} {s['completed']:>6} {s['browsers']:>9} "
+              f"{format_bytes(s['app_rss']):>10} {format_bytes(s['chrome_rss']):>11}")
+
+
+def check_regression(summary, baseline, max_regression):
+    """Returns a list of metrics that got worse than the baseline by more than max_regression."""
+    failures = []
+    if summary['throughput_per_min'] < baseline['throughput_per_min'] * (1 - max_regression):
+        failures.append(f"throughput {summary['throughput_per_min']:.2f}/min "
+                        f"vs baseline {baseline['throughput_per_min']:.2f}/min")
+    for pct in ('p50', 'p95'):
+        if summary['latency_s'][pct] > baseline['latency_s'][pct] * (1 + max_regression):
+            failures.append(f"latency {pct} {summary['latency_s'][pct]:.1f}s "
+                            f"vs baseline {baseline['latency_s'][pct]:.1f}s")
+    if summary['error_rate'] > baseline['error_rate'] + max_regression / 10:
+        failures.append(f"error rate {summary['error_rate']:.1%} vs baseline {baseline['error_rate']:.1%}")
+    if summary['peak_app_rss'] > baseline['peak_app_rss'] * (1 + max_regression):
+        failures.append(f"peak app RSS {format_bytes(summary['peak_app_rss'])} "
+                        f"vs baseline {format_bytes(baseline['peak_app_rss'])}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=4, help='concurrent users (sessions)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='arrivals per second for an open-loop test (0 = closed loop)')
+    parser.add_argument('--duration', type=float, default=300, help='seconds to generate load for')
+    parser.add_argument('--languages', default='bengali=1',
+                        help='language mix, e.g. "bengali=0.6,french=0.3,hindi+tamil=0.1"')
+    parser.add_argument('--sample-interval', type=float, default=5, help='seconds between resource samples')
+    parser.add_argument('--sentences', type=int, default=300, help='policy sentences on the fixture page')
+    parser.add_argument('--use-cache', action='store_true', help='go through the shared result cache')
+    parser.add_argument('--stock-browser', action='store_true', help='disable the lean browser profile')
+    parser.add_argument('--output', help='write the summary as JSON to this file')
+    parser.add_argument('--baseline', help='JSON summary from an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='allowed relative regression against the baseline')
+    args = parser.parse_args()
+
+    if args.stock_browser:
+        scraper.BROWSER_PROFILE = None
+
+    site = FixtureSite(sentence_count=args.sentences).start()
+    try:
+        test = LoadTest(site.base_url, args.users, parse_language_mix(args.languages), args.use_cache)
+        elapsed = test.run(args.duration, args.rate, args.sample_interval)
+    finally:
+        site.stop()
+
+    config = {key: getattr(args, key) for key in ('users', 'rate', 'duration', 'languages', 'use_cache', 'stock_browser')}
+    summary = test.summary(elapsed)
+    print_report(config, summary)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': config, **summary}, f, indent=2)
+        print(f"\nSummary written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = check_regression(summary, baseline, args.max_regression)
+        if failures:
+            print("\nREGRESSION against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\nNo regression against baseline.")
+
+
+if __name__ == "__main__":
+    main()
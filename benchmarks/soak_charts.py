@@ -0,0 +1,77 @@
+"""
+Soak test for the cached risk chart.
+
+Simulates thousands of dashboard reruns, drawing count tuples from a pool
+larger than the chart cache so both hits and evictions happen, and checks
+that memory stays flat and no Matplotlib figures are left open.
+
+Usage:
+    python benchmarks/soak_charts.py --reruns 5000
+Exits with status 1 if memory grows by more than --max-growth-mb after warm-up.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import matplotlib.pyplot as plt
+import core.charts as charts
+from core.procstats import read_memory, format_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reruns', type=int, default=5000)
+    parser.add_argument('--unique', type=int, default=charts.MAX_CACHED_CHARTS * 2,
+                        help='distinct (high, medium, low) tuples to draw from')
+    parser.add_argument('--samples', type=int, default=10, help='memory samples to take')
+    parser.add_argument('--max-growth-mb', type=float, default=10.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = list({(rng.randint(0, 15), rng.randint(0, 15), rng.randint(0, 200)) for _ in range(args.unique * 2)})
+    pool = pool[:args.unique]
+
+    charts.render_pie_chart.cache_clear()
+    tracemalloc.start()
+    sample_every = max(1, args.reruns // args.samples)
+    samples = []
+    start = time.perf_counter()
+
+    for i in range(1, args.reruns + 1):
+        charts.render_pie_chart(*rng.choice(pool))
+        if i % sample_every == 0:
+            gc.collect()
+            traced, _ = tracemalloc.get_traced_memory()
+            samples.append((i, read_memory(os.getpid())['rss'], traced))
+
+    elapsed = time.perf_counter() - start
+    info = charts.render_pie_chart.cache_info()
+
+    print(f"{args.reruns} reruns over {len(pool)} distinct tuples in {elapsed:.1f}s "
+          f"({elapsed / args.reruns * 1000:.2f} ms/rerun)")
+    print(f"cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+    print(f"{'rerun':>7} {'rss':>10} {'python heap':>12}")
+    for i, rss, traced in samples:
+        print(f"{i:>7} {format_bytes(rss):>10} {format_bytes(traced):>12}")
+
+    open_figures = len(plt.get_fignums())
+    # Compare against a sample taken after the cache has filled up
+    baseline = samples[len(samples) // 2]
+    growth = samples[-1][1] - baseline[1]
+    print(f"open pyplot figures: {open_figures}")
+    print(f"rss growth since rerun {baseline[0]}: {format_bytes(growth)}")
+
+    if open_figures or growth > args.max_growth_mb * 1024 * 1024:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import joblib
+import hashlib
 import os
 import re
 
@@ -16,6 +17,18 @@ except FileNotFoundError:
     print("Error: Models not found. Please run 'training/train_classifier.py' first.")
     MODELS_LOADED = False
 
+def _model_version():
+    """Digest of the saved model files, so caches notice when the classifier is retrained."""
+    if not MODELS_LOADED:
+        return None
+    digest = hashlib.sha256()
+    for path in (VECTORIZER_PATH, MODEL_PATH):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+MODEL_VERSION = _model_version()
+
 # We can keep these as a fallback
 RISK_KEYWORDS = {
     'high': ['sell your data', 'share with advertisers', 'no control', 'waive your rights', 'tracking', 'no deletion'],
@@ -0,0 +1,62 @@
+from urllib.parse import urlparse
+
+# --- Lean Browser Profile ---
+# We only ever read anchors and text, so everything else Chrome would
+# normally download (images, fonts, video, ads, trackers) is wasted time.
+# Requests are dropped by the resource type Chrome assigns them (Image,
+# Font, Media, ...) rather than by URL, so a page whose own address
+# happens to contain ".gif" or ".mov" can't be blocked by mistake.
+
+# Ad, analytics and embed hosts that never carry policy text
+BLOCKED_HOSTS = [
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com',
+    'google-analytics.com', 'googletagmanager.com', 'googletagservices.com',
+    'connect.facebook.net', 'adnxs.com', 'criteo.com', 'taboola.com',
+    'outbrain.com', 'scorecardresearch.com', 'hotjar.com', 'segment.io',
+    'newrelic.com', 'nr-data.net', 'youtube-nocookie.com', 'player.vimeo.com',
+]
+
+# Chrome resource types (lower-cased) that are never blocked, whatever the profile says
+NEVER_BLOCKED_TYPES = {'document'}
+
+LEAN_PROFILE = {
+    'block_resource_types': ['image', 'font', 'media'],
+    'blocked_hosts': BLOCKED_HOSTS,
+    'disable_images': True,
+    'disable_extensions': True,
+    'js_heap_mb': 256,  # V8 old-space cap per renderer
+}
+
+def is_blocked_host(profile, url):
+    """True if the URL's host is, or is a subdomain of, one of the profile's blocked hosts."""
+    host = (urlparse(url).hostname or '').lower()
+    return any(host == blocked or host.endswith('.' + blocked)
+               for blocked in profile.get('blocked_hosts', []))
+
+def should_block(profile, url, resource_type):
+    """
+    Decides whether a request is dropped under a browser profile.
+    resource_type is Chrome's type for the request (e.g. 'Image', 'Font', 'Document').
+    Documents are only ever blocked by host, never by type.
+    """
+    if is_blocked_host(profile, url):
+        return True
+    resource_type = (resource_type or '').lower()
+    if resource_type in NEVER_BLOCKED_TYPES:
+        return False
+    return resource_type in profile.get('block_resource_types', [])
+
+def build_blocked_urls(profile):
+    """
+    Turns a profile's blocked hosts into Network.setBlockedURLs patterns.
+    Only used when request interception is unavailable, so resource types can't be
+    blocked there. Chrome matches these as plain wildcards, so each host also gets
+    a variant with an explicit port.
+    """
+    patterns = []
+    for host in profile.get('blocked_hosts', []):
+        patterns.append(f"*://{host}/*")
+        patterns.append(f"*://{host}:*/*")
+        patterns.append(f"*://*.{host}/*")
+        patterns.append(f"*://*.{host}:*/*")
+    return patterns
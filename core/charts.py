@@ -0,0 +1,94 @@
+import functools
+import io
+import re
+from matplotlib.figure import Figure
+
+# Charts are rendered once per unique (high, medium, low) count tuple and
+# kept as PNG bytes, so Streamlit reruns and PDF reports reuse the same image.
+# Figures are built with the object-oriented API rather than pyplot, so they
+# never enter pyplot's global figure registry and can't accumulate there.
+MAX_CACHED_CHARTS = 256
+
+def count_sentences(text):
+    """Estimate sentence count to calculate low risk portion."""
+    # Using the same regex logic as analyzer.py
+    sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', text)
+    # Filter tiny sentences
+    sentences = [s.strip() for s in sentences if len(s.split()) > 5]
+    return len(sentences)
+
+def calculate_counts(highlights, full_text):
+    """Helper to calculate counts for logic and chart."""
+    total_sentences = count_sentences(full_text)
+    high_count = sum(1 for h in highlights if "[HIGH RISK]" in h)
+    medium_count = sum(1 for h in highlights if "[MEDIUM RISK]" in h)
+
+    # Estimate Low Risk
+    low_count = max(0, total_sentences - high_count - medium_count)
+    return high_count, medium_count, low_count
+
+@functools.lru_cache(maxsize=MAX_CACHED_CHARTS)
+def render_pie_chart(high_count, medium_count, low_count):
+    """Renders the risk distribution pie chart to PNG bytes. Returns None if there is no data."""
+
+    # Prepare Data
+    labels = ['High Risk', 'Medium Risk', 'Low Risk (Safe)']
+    sizes = [high_count, medium_count, low_count]
+    colors = ['#ef4444', '#f59e0b', '#22c55e'] # Red, Amber, Green
+
+    # Filter out zero values
+    final_labels = []
+    final_sizes = []
+    final_colors = []
+    for l, s, c in zip(labels, sizes, colors):
+        if s > 0:
+            final_labels.append(l)
+            final_sizes.append(s)
+            final_colors.append(c)
+
+    if not final_sizes:
+        return None
+
+    # Identify the "Main Prediction" (Largest Slice)
+    max_val = max(final_sizes)
+    max_idx = final_sizes.index(max_val)
+
+    # Create Explode array (Pop out the largest slice)
+    explode = [0.1 if i == max_idx else 0 for i in range(len(final_sizes))]
+
+    # Create Plot
+    fig = Figure(figsize=(5, 5))
+    try:
+        ax = fig.subplots()
+
+        wedges, texts, autotexts = ax.pie(
+            final_sizes,
+            labels=final_labels,
+            autopct='%1.1f%%',
+            startangle=90,
+            colors=final_colors,
+            explode=explode,
+            textprops={'fontsize': 10, 'color': '#333'},
+            wedgeprops={'edgecolor': 'white', 'linewidth': 1}
+        )
+
+        # Apply Fade Effect
+        for i, wedge in enumerate(wedges):
+            if i == max_idx:
+                wedge.set_alpha(1.0) # Full brightness
+            else:
+                wedge.set_alpha(0.3) # Faded
+
+        # Style percentage text
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_weight('bold')
+
+        ax.axis('equal')
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', transparent=True) # Transparent background
+        return buffer.getvalue()
+    finally:
+        # Drop the artists now rather than whenever the garbage collector gets to them
+        fig.clear()
@@ -1,21 +1,70 @@
 from fpdf import FPDF
+from fpdf.fonts import SubsetMap
+from fontTools import ttLib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import copy
 import datetime
+import hashlib
+import io
+import json
 import os
+import threading
+import core.charts as charts
 
 CORE_DIR = os.path.dirname(os.path.abspath(__file__))
 FONT_PATH = os.path.join(CORE_DIR, 'NotoSansBengali-Regular.ttf')
+FONT_KEY = 'notosans'
+
+# Rendered reports, keyed by a hash of everything that ends up in the PDF
+MAX_CACHED_REPORTS = 32
+
+# --- Font Cache ---
+# Parsing the TTF (metrics and widths for every glyph) is the most expensive
+# part of a report, so it's done once per process. Every PDF gets a shallow
+# copy of the parsed font: the cmap, glyph widths and font descriptor are
+# shared, while the glyph subset, missing-glyph list and TTFont handle are
+# its own, since fpdf subsets that handle in place on output.
+_font_lock = threading.Lock()
+_font_prototype = None
+_font_bytes = None
+_font_loaded = False
+
+def _load_font_prototype():
+    """Parses the Unicode font once and returns it, or None if it can't be loaded."""
+    global _font_prototype, _font_bytes, _font_loaded
+    with _font_lock:
+        if not _font_loaded:
+            try:
+                loader = FPDF()
+                loader.add_font('NotoSans', '', FONT_PATH)
+                _font_prototype = loader.fonts[FONT_KEY]
+                with open(FONT_PATH, 'rb') as f:
+                    _font_bytes = f.read()
+                print("Successfully loaded Unicode font.")
+            except (RuntimeError, OSError) as e:
+                print(f"Warning: Could not load Unicode font NotoSansBengali-Regular.ttf. {e}")
+                _font_prototype = None
+            _font_loaded = True
+        return _font_prototype
 
 class PDF(FPDF):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Add the Unicode font right away.
         # We'll use this for ALL text (English and Bengali)
-        try:
-            self.add_font('NotoSans', '', FONT_PATH, uni=True)
+        prototype = _load_font_prototype()
+        if prototype is not None:
+            font = copy.copy(prototype)
+            font.i = len(self.fonts) + 1
+            # Lazy, so only the tables the subsetter needs are ever read
+            font.ttfont = ttLib.TTFont(io.BytesIO(_font_bytes), recalcTimestamp=False, fontNumber=0, lazy=True)
+            font.subset = SubsetMap(font)  # Glyphs used by this document only
+            font.missing_glyphs = []
+            font.biggest_size_pt = 0
+            self.fonts[FONT_KEY] = font
             self.font_added = True
-            print("Successfully loaded Unicode font.")
-        except RuntimeError as e:
-            print(f"Warning: Could not load Unicode font NotoSansBengali-Regular.ttf. {e}")
+        else:
             self.font_added = False
 
     def header(self):
@@ -61,20 +110,76 @@ class PDF(FPDF):
         self.multi_cell(0, 5, content)
         self.ln(5)
 
+# Only these fields end up in the report (full_text in particular doesn't)
+REPORT_FIELDS = ['url', 'overall_risk', 'summary', 'language', 'translated_summary', 'translations', 'highlights']
+
+_report_cache = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+def _to_latin1(text):
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+def _latin1_copy(analysis_data):
+    """Returns a copy of the report fields that the built-in (latin-1) fonts can print."""
+    cleaned = dict(analysis_data)
+    for key in ['url', 'overall_risk', 'summary', 'translated_summary']:
+        if key in cleaned and isinstance(cleaned[key], str):
+            cleaned[key] = _to_latin1(cleaned[key])
+    if 'highlights' in cleaned:
+        cleaned['highlights'] = [_to_latin1(s) for s in cleaned['highlights']]
+    if 'translations' in cleaned:
+        cleaned['translations'] = {lang: _to_latin1(text) for lang, text in cleaned['translations'].items()}
+    return cleaned
+
+def _risk_counts(analysis_data):
+    """(high, medium, low) counts for the chart, or None without the text to count from."""
+    if 'full_text' not in analysis_data or 'highlights' not in analysis_data:
+        return None
+    return charts.calculate_counts(analysis_data['highlights'], analysis_data['full_text'])
+
+def report_key(analysis_data):
+    """Hash of everything that affects the rendered PDF, including today's date in the header."""
+    fields = {key: analysis_data.get(key) for key in REPORT_FIELDS}
+    fields['risk_counts'] = _risk_counts(analysis_data)
+    fields['date'] = str(datetime.date.today())
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
 def create_report(analysis_data):
+    """Returns the PDF report as bytes, reusing an earlier render of identical results."""
+    key = report_key(analysis_data)
+    with _report_cache_lock:
+        if key in _report_cache:
+            _report_cache.move_to_end(key)
+            return _report_cache[key]
+
+    pdf_bytes = render_report(analysis_data)
+
+    with _report_cache_lock:
+        _report_cache[key] = pdf_bytes
+        while len(_report_cache) > MAX_CACHED_REPORTS:
+            _report_cache.popitem(last=False)
+    return pdf_bytes
+
+def create_reports(reports, max_workers=None):
+    """
+    Renders many reports in a process pool, returning the PDFs in the same order.
+    Each worker parses the font once and reuses it for every report it renders.
+    """
+    if not reports:
+        return []
+    max_workers = max_workers or min(len(reports), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_load_font_prototype) as pool:
+        return list(pool.map(render_report, reports, chunksize=max(1, len(reports) // (max_workers * 4))))
+
+def render_report(analysis_data):
+    """Renders one report without consulting the cache. Never modifies analysis_data."""
     pdf = PDF()
     
     # Clean all text if Unicode font is not available
     if not pdf.font_added:
         print("Warning: Unicode font not found. Cleaning text for PDF.")
-        for key in ['url', 'overall_risk', 'summary', 'translated_summary']:
-            if key in analysis_data and isinstance(analysis_data[key], str):
-                analysis_data[key] = analysis_data[key].encode('latin-1', 'replace').decode('latin-1')
-        
-        if 'highlights' in analysis_data:
-            analysis_data['highlights'] = [
-                s.encode('latin-1', 'replace').decode('latin-1') for s in analysis_data['highlights']
-            ]
+        analysis_data = _latin1_copy(analysis_data)
 
     pdf.add_page()
     
@@ -99,16 +204,26 @@ def create_report(analysis_data):
     pdf.cell(0, 10, f"Overall Risk: {analysis_data['overall_risk']}", 0, 1)
     pdf.set_text_color(0, 0, 0) # Reset color
     pdf.ln(5)
+
+    # Risk distribution chart (the same cached image the dashboard shows)
+    counts = _risk_counts(analysis_data)
+    chart_png = charts.render_pie_chart(*counts) if counts else None
+    if chart_png:
+        pdf.image(io.BytesIO(chart_png), x=(pdf.w - 80) / 2, w=80)
+        pdf.ln(5)
     
     # 2. Summary (English)
     pdf.add_section('Easy-to-Read Summary (English)', analysis_data['summary'])
     
-    # 3. Translated Summary
-    lang_name = analysis_data['language'].capitalize()
-    pdf.add_section(f'Summary ({lang_name})', analysis_data['translated_summary'])
+    # 3. Translated Summaries (one section per language)
+    translations = analysis_data.get('translations')
+    if not translations and 'translated_summary' in analysis_data:
+        translations = {analysis_data['language']: analysis_data['translated_summary']}
+    for lang, translated in (translations or {}).items():
+        pdf.add_section(f'Summary ({lang.capitalize()})', translated)
     
     # 4. Key Highlights
     pdf.add_section('Key Highlights & Risks', '\n'.join(analysis_data['highlights']))
     
     # Return the PDF as bytes
-    return bytes(pdf.output(dest='S'))
\ No newline at end of file
+    return bytes(pdf.output())
\ No newline at end of file
@@ -0,0 +1,213 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+import core.scraper as scraper
+import core.analyzer as analyzer
+import core.processor as processor
+import core.translation_memory as translation_memory
+import core.result_cache as result_cache
+
+# Summarization and translation take seconds, while scraping and risk
+# classification are what the dashboard needs first. The slow stages run
+# on this shared pool so the UI can render as soon as classification is done.
+MAX_BACKGROUND_WORKERS = 2
+_executor = ThreadPoolExecutor(max_workers=MAX_BACKGROUND_WORKERS, thread_name_prefix='policyguard-bg')
+
+# Stale cache entries are recomputed here, one at a time, so refreshes
+# never hold up the analyses users are waiting on
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='policyguard-refresh')
+
+
+class AnalysisJob:
+    """
+    Runs the slow stages (summarize, then translate) for one analysis in the background.
+    Partial results are exposed as attributes as soon as each stage finishes;
+    `translations` fills in one language at a time.
+    """
+
+    def __init__(self, results, languages, domain=None, cache_key=None):
+        self.domain = domain
+        self.cache_key = cache_key
+        self.languages = list(languages)
+        self.summary = None
+        self.translations = {}
+        self.translation_stats = translation_memory.new_stats()
+        self.error = None
+        self._cancel_event = threading.Event()
+        self._base_results = dict(results)
+        self._future = _executor.submit(self._run, results['full_text'])
+
+    def _run(self, full_text):
+        if self.cancelled:
+            return
+        self.summary = processor.summarize_text(full_text)
+
+        # A model call can't be interrupted, so cancellation is checked between
+        # stages, and between languages inside the fan-out
+        if self.cancelled:
+            return
+        processor.translate_many(
+            self.summary, self.languages,
+            on_result=self._store_translation, metrics=self.translation_stats,
+            cancel_event=self._cancel_event,
+        )
+
+        # Share the finished analysis with every other process
+        if self.cache_key and not self.cancelled:
+            final_results = self.apply_to(dict(self._base_results))
+            if is_cacheable(final_results):
+                store_cached(self.cache_key, final_results)
+
+    def _store_translation(self, language, translation):
+        if not self.cancelled:
+            self.translations[language] = translation
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self):
+        """True once the job has finished, failed or been cancelled."""
+        return self._future.done() or self.cancelled
+
+    def cancel(self):
+        """Stops the job. Work that hasn't started yet never runs."""
+        self._cancel_event.set()
+        self._future.cancel()
+
+    def wait(self, timeout=None):
+        """Blocks until the job has finished. Used outside of the dashboard."""
+        try:
+            self._future.result(timeout=timeout)
+        except CancelledError:
+            pass
+        except Exception as e:
+            self.error = str(e)
+
+    def apply_to(self, results):
+        """Copies the finished stages into a results dict."""
+        if self._future.done() and not self._future.cancelled() and self._future.exception():
+            self.error = str(self._future.exception())
+        if self.summary is not None:
+            results['summary'] = self.summary
+        if self.translations:
+            results['translations'] = dict(self.translations)
+            # The first language doubles as the single-language fields used by older reports
+            first = next((lang for lang in self.languages if lang in self.translations), None)
+            if first:
+                results['language'] = first
+                results['translated_summary'] = self.translations[first]
+            results.setdefault('metrics', {})['translation_memory'] = translation_memory.report(
+                self.translation_stats
+            )
+        return results
+
+
+def analyze_domain(base_url, languages):
+    """
+    Runs every stage synchronously, without the dashboard.
+    Returns (results, error); results is None if the analysis could not complete.
+    """
+    policy_urls = scraper.find_policy_links(base_url)
+    if not policy_urls:
+        return None, f"Could not find any policy pages for {base_url}"
+
+    main_policy_url = policy_urls[0]
+    full_text, error = scraper.extract_text_from_url(main_policy_url)
+    if error and not full_text:
+        return None, error
+
+    overall_risk, highlights = analyzer.analyze_risk(full_text)
+    summary = processor.summarize_text(full_text)
+    translation_stats = translation_memory.new_stats()
+    translations = processor.translate_many(summary, languages, metrics=translation_stats)
+
+    results = {
+        'url': main_policy_url,
+        'full_text': full_text,
+        'overall_risk': overall_risk,
+        'highlights': highlights,
+        'summary': summary,
+        'languages': list(languages),
+        'translations': translations,
+        'metrics': {'translation_memory': translation_memory.report(translation_stats)},
+    }
+    if translations:
+        first = next(iter(translations))
+        results['language'] = first
+        results['translated_summary'] = translations[first]
+    return results, None
+
+
+# --- Shared Result Cache ---
+def model_versions(languages):
+    """Versions of every model that contributes to an analysis in these languages."""
+    versions = {'classifier': analyzer.MODEL_VERSION}
+    if processor.MODELS_LOADED:
+        versions['summarizer'] = processor.model_version(processor.summarizer)
+        for lang in languages:
+            if lang in processor.TRANSLATORS:
+                versions[lang] = processor.model_version(processor.TRANSLATORS[lang])
+    return versions
+
+
+def cache_key(domain, languages):
+    return result_cache.make_key(domain, languages, model_versions(languages))
+
+
+def is_cacheable(results):
+    """Results produced while a model was missing or failing are not worth sharing."""
+    if results.get('overall_risk') == 'Error':
+        return False
+    texts = [results.get('summary', '')] + list(results.get('translations', {}).values())
+    return all(
+        text and not text.startswith('Error:') and processor.TRANSLATION_ERROR not in text
+        for text in texts
+    )
+
+
+def store_cached(key, results):
+    """Shares finished results. Metrics describe the run that produced them, so they're left out."""
+    result_cache.cache.put(key, {field: value for field, value in results.items() if field != 'metrics'})
+
+
+def _refresh(domain, languages, key):
+    try:
+        results, error = analyze_domain(domain, languages)
+    except Exception as e:
+        results, error = None, str(e)
+
+    if results is not None and is_cacheable(results):
+        store_cached(key, results)
+    else:
+        print(f"Background refresh of {domain} failed: {error}")
+        result_cache.cache.release_refresh(key)
+
+
+def lookup_cached(domain, languages):
+    """
+    Returns cached results for an analysis, or None on a miss.
+    A stale entry is still returned, and one process recomputes it in the background.
+    """
+    key = cache_key(domain, languages)
+    results, status = result_cache.cache.get(key)
+    if results is None:
+        return None
+
+    # Only this lookup's metrics, not those of the run that filled the cache
+    results['metrics'] = {'result_cache': status}
+    if status == result_cache.STALE and result_cache.cache.claim_refresh(key):
+        _refresh_executor.submit(_refresh, domain, languages, key)
+    return results
+
+
+def analyze_domain_cached(domain, languages):
+    """analyze_domain() backed by the shared result cache."""
+    results = lookup_cached(domain, languages)
+    if results is not None:
+        return results, None
+
+    results, error = analyze_domain(domain, languages)
+    if results is not None and is_cacheable(results):
+        store_cached(cache_key(domain, languages), results)
+    return results, error
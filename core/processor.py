@@ -1,17 +1,26 @@
 from transformers import pipeline
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextlib
+import threading
+import time
+import re
 import torch
+import core.translation_memory as translation_memory
 
 # Initialize pipelines (this will download models the first time)
 try:
     summarizer = pipeline("summarization", model="t5-small")
     
     # Map of languages to model names
+    TRANSLATOR_MODELS = {
+        'bengali': ("translation_en_to_bn", "shhossain/opus-mt-en-to-bn"),
+        'french': ("translation_en_to_fr", "Helsinki-NLP/opus-mt-en-fr"),
+        'russian': ("translation_en_to_ru", "Helsinki-NLP/opus-mt-en-ru"),
+        'hindi': ("translation_en_to_hi", "Helsinki-NLP/opus-mt-en-hi"), # <-- This line is now fixed
+        'tamil': ("translation_en_to_ta", "aryaumesh/english-to-tamil"),
+    }
     TRANSLATORS = {
-        'bengali': pipeline("translation_en_to_bn", model="shhossain/opus-mt-en-to-bn"),
-        'french': pipeline("translation_en_to_fr", model="Helsinki-NLP/opus-mt-en-fr"),
-        'russian': pipeline("translation_en_to_ru", model="Helsinki-NLP/opus-mt-en-ru"),
-        'hindi': pipeline("translation_en_to_hi", model="Helsinki-NLP/opus-mt-en-hi"), # <-- This line is now fixed
-        'tamil': pipeline("translation_en_to_ta", model="aryaumesh/english-to-tamil"),
+        lang: pipeline(task, model=model_name) for lang, (task, model_name) in TRANSLATOR_MODELS.items()
     }
     MODELS_LOADED = True
 except Exception as e:
@@ -39,34 +48,203 @@ def summarize_text(text, max_length=200, min_length=50):
         return "Error: Could not produce summary."
 
 
-def translate_text(text, target_language='bengali'):
-    """Translates text to the target language, handling long inputs."""
-    if not MODELS_LOADED:
-        return "Error: Translation models not loaded."
-        
-    if target_language not in TRANSLATORS:
-        return f"Error: Translation for '{target_language}' is not supported."
-    
-    translator = TRANSLATORS[target_language]
-    
-    # --- CHUNKING LOGIC ---
-    # This logic will still work perfectly, as it will now only receive
-    # the short ~200-word summary, which is well below the chunk limit.
-    max_chunk_length = 400 # Approx words, safely under the token limit
-    
+def model_version(hf_pipeline):
+    """Returns '<model name>@<hub revision>' for a loaded pipeline, used to key caches."""
+    config = hf_pipeline.model.config
+    name = getattr(config, '_name_or_path', None) or type(hf_pipeline.model).__name__
+    revision = getattr(config, '_commit_hash', None)
+    return f"{name}@{revision}" if revision else name
+
+
+def _chunk_text(text, max_chunk_length=400):
+    """Splits text into chunks of roughly max_chunk_length words."""
     words = text.split()
-    text_chunks = [' '.join(words[i:i + max_chunk_length]) for i in range(0, len(words), max_chunk_length)]
-    
+    return [' '.join(words[i:i + max_chunk_length]) for i in range(0, len(words), max_chunk_length)]
+
+
+def _split_sentences(text):
+    """
+    Splits text into the sentences that are translated (and remembered) one by one.
+    A run-on "sentence" longer than a chunk is split by words so it stays under the token limit.
+    """
+    sentences = []
+    for sentence in re.split(r'(?<=[.!?])\s+', text.strip()):
+        sentences.extend(_chunk_text(sentence))
+    return sentences
+
+
+# Sentences per forward pass; without it the pipeline runs one item at a time
+TRANSLATION_BATCH_SIZE = 16
+
+# Stands in for a sentence the model failed to translate
+TRANSLATION_ERROR = "[Translation Error for this section]"
+
+
+def _translate_chunks(translator, text_chunks, cancel_event=None):
+    """
+    Translates a list of chunks, TRANSLATION_BATCH_SIZE at a time. Failed chunks come back
+    as None, as do the remaining chunks once cancel_event is set.
+    """
+    translated_chunks = []
+    for start in range(0, len(text_chunks), TRANSLATION_BATCH_SIZE):
+        batch = text_chunks[start:start + TRANSLATION_BATCH_SIZE]
+        if cancel_event is not None and cancel_event.is_set():
+            translated_chunks.extend([None] * len(batch))
+        else:
+            translated_chunks.extend(_translate_batch(translator, batch))
+    return translated_chunks
+
+
+def _translate_batch(translator, text_chunks):
+    """Translates one batch in a single call, retrying chunk by chunk if that fails."""
+    try:
+        translations = translator(text_chunks, max_length=512, batch_size=TRANSLATION_BATCH_SIZE)
+        return [t['translation_text'] for t in translations]
+    except Exception as e:
+        print(f"Error during batch translation, retrying chunk by chunk: {e}")
+
     translated_chunks = []
-    
-    # Translate each chunk one by one
     for chunk in text_chunks:
         try:
-            translation = translator(chunk, max_length=512) 
+            translation = translator(chunk, max_length=512)
             translated_chunks.append(translation[0]['translation_text'])
         except Exception as e:
             print(f"Error during translation chunk: {e}")
-            translated_chunks.append(f"[Translation Error for this section]")
+            translated_chunks.append(None)
+    return translated_chunks
+
+
+def _translate_sentences(target_language, sentences, cancel_event=None):
+    """
+    Translates a list of sentences, consulting the translation memory first
+    and only sending the misses to the model. Returns (translation, stats).
+    """
+    translator = TRANSLATORS[target_language]
+    model_id = model_version(translator)
+    stats = translation_memory.new_stats()
+
+    known = translation_memory.memory.lookup(target_language, model_id, sentences, stats)
+    normalized = [translation_memory.normalize_sentence(s) for s in sentences]
+    misses = [s for s in dict.fromkeys(normalized) if s not in known]
+
+    if misses:
+        start = time.perf_counter()
+        translated = _translate_chunks(translator, misses, cancel_event)
+        elapsed = time.perf_counter() - start
+        stats['misses'] += len(misses)
+        stats['translate_s'] += elapsed
+
+        new_entries = {s: t for s, t in zip(misses, translated) if t is not None}
+        translation_memory.memory.store(
+            target_language, model_id, new_entries, cost_per_sentence=elapsed / len(misses)
+        )
+        known.update(new_entries)
+
+    translated_text = ' '.join(
+        known.get(s, TRANSLATION_ERROR) for s in normalized
+    )
+    return translated_text, stats
+
+
+def translate_text(text, target_language='bengali', metrics=None):
+    """
+    Translates text to the target language, handling long inputs.
+    If a metrics dict is given, translation memory stats are added to it.
+    """
+    if not MODELS_LOADED:
+        return "Error: Translation models not loaded."
+        
+    if target_language not in TRANSLATORS:
+        return f"Error: Translation for '{target_language}' is not supported."
     
-    # Join the translated chunks back together
-    return ' '.join(translated_chunks)
\ No newline at end of file
+    # Sentence by sentence, so repeated sentences can come from the translation memory
+    translated_text, stats = _translate_sentences(target_language, _split_sentences(text))
+    if metrics is not None:
+        translation_memory.merge_stats(metrics, stats)
+    return translated_text
+
+
+# --- Multi-Language Fan-Out ---
+# Each Marian model runs on its own thread (torch releases the GIL during
+# inference). While more than one language is being translated, torch's
+# intra-op pool is split between them so that workers x intra-op threads
+# stays within the process's budget (server.py sets that per worker). The
+# count is restored once the last concurrent fan-out finishes, and a single
+# language leaves it alone, so summaries and one-language jobs keep every thread.
+MAX_TRANSLATION_WORKERS = 4
+_threads_lock = threading.Lock()
+_active_fan_outs = 0
+_thread_budget = None  # torch's thread count before the first active fan-out
+
+
+@contextlib.contextmanager
+def _split_threads(width):
+    """Shares torch's intra-op threads between `width` concurrent translations."""
+    global _active_fan_outs, _thread_budget
+    if width <= 1:
+        yield
+        return
+
+    with _threads_lock:
+        if _active_fan_outs == 0:
+            _thread_budget = torch.get_num_threads()
+        _active_fan_outs += 1
+        torch.set_num_threads(max(1, _thread_budget // width))
+    try:
+        yield
+    finally:
+        with _threads_lock:
+            _active_fan_outs -= 1
+            if _active_fan_outs == 0:
+                torch.set_num_threads(_thread_budget)
+
+
+def translate_many(text, languages=None, max_workers=None, on_result=None, metrics=None, cancel_event=None):
+    """
+    Translates text into several languages concurrently.
+    Returns a dict of {language: translation}. If given, on_result(language, translation)
+    is called as each language finishes, and translation memory stats are added to metrics.
+    Once cancel_event is set, languages that haven't started are skipped and left out of the result.
+    """
+    languages = list(dict.fromkeys(languages if languages is not None else TRANSLATORS))
+    if not languages:
+        return {}
+
+    if not MODELS_LOADED:
+        return {lang: "Error: Translation models not loaded." for lang in languages}
+
+    translations = {}
+    supported = []
+    for lang in languages:
+        if lang in TRANSLATORS:
+            supported.append(lang)
+        else:
+            translations[lang] = f"Error: Translation for '{lang}' is not supported."
+            if on_result:
+                on_result(lang, translations[lang])
+
+    # Split once, every language translates the same batch of sentences
+    sentences = _split_sentences(text)
+    workers = max(1, min(max_workers or MAX_TRANSLATION_WORKERS, len(supported)))
+
+    def translate(lang):
+        # A model call can't be interrupted, but a queued language or batch can be dropped
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        return _translate_sentences(lang, sentences, cancel_event)
+
+    with _split_threads(workers), ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate') as pool:
+        futures = {pool.submit(translate, lang): lang for lang in supported}
+        for future in as_completed(futures):
+            lang = futures[future]
+            result = future.result()
+            if result is None:
+                continue
+            translations[lang], stats = result
+            if metrics is not None:
+                translation_memory.merge_stats(metrics, stats)
+            if on_result:
+                on_result(lang, translations[lang])
+
+    # Keep the caller's language order
+    return {lang: translations[lang] for lang in languages if lang in translations}
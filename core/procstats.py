@@ -0,0 +1,110 @@
+import os
+
+# Process memory helpers. These read Linux /proc directly so that the
+# benchmarks and server tooling don't need an extra dependency.
+PROC_DIR = '/proc'
+
+
+def _read_ppid(pid):
+    """Returns the parent pid of a process, or None if it has gone away."""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'stat')) as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name can contain spaces, so split after the closing paren
+    fields = stat[stat.rfind(')') + 2:].split()
+    return int(fields[1])
+
+
+def process_name(pid):
+    """Returns the short command name of a process, or '' if it has gone away."""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'comm')) as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def process_cmdline(pid):
+    """Returns the full command line of a process as one string, or '' if it has gone away."""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'cmdline'), 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode('utf-8', 'replace').strip()
+    except OSError:
+        return ''
+
+
+def _children_map():
+    children = {}
+    for entry in os.listdir(PROC_DIR):
+        if not entry.isdigit():
+            continue
+        ppid = _read_ppid(entry)
+        if ppid is not None:
+            children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def child_pids(pid):
+    """Returns the pids of the direct children of a process."""
+    return _children_map().get(pid, [])
+
+
+def descendant_pids(pid):
+    """Returns the pids of every process below `pid` in the process tree."""
+    children = _children_map()
+    found = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def read_memory(pid):
+    """
+    Returns a dict with 'rss', 'pss' and 'uss' (in bytes) for a process.
+    USS is the memory unique to that process, i.e. what would be freed if it exited.
+    """
+    memory = {'rss': 0, 'pss': 0, 'uss': 0}
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'smaps_rollup')) as f:
+            lines = f.readlines()
+    except OSError:
+        return memory
+
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 3 or parts[2] != 'kB':
+            continue
+        key, value = parts[0].rstrip(':'), int(parts[1]) * 1024
+        if key == 'Rss':
+            memory['rss'] = value
+        elif key == 'Pss':
+            memory['pss'] = value
+        elif key in ('Private_Clean', 'Private_Dirty'):
+            memory['uss'] += value
+    return memory
+
+
+def tree_memory(pid, include_self=True):
+    """Sums read_memory() over a process and all of its descendants."""
+    pids = descendant_pids(pid)
+    if include_self:
+        pids.append(pid)
+
+    total = {'rss': 0, 'pss': 0, 'uss': 0, 'processes': len(pids)}
+    for p in pids:
+        for key, value in read_memory(p).items():
+            total[key] += value
+    return total
+
+
+def format_bytes(num):
+    """Formats a byte count as a short human readable string."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(num) < 1024 or unit == 'GB':
+            return f"{num:.1f} {unit}" if unit != 'B' else f"{num} B"
+        num /= 1024
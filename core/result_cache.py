@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from core.sqlite_store import CACHE_DIR, SQLiteStore
+
+# Finished analyses, shared by every dashboard / server process on the machine.
+# Entries are fresh for RESULT_TTL, then served stale (while one process
+# recomputes them) for up to STALE_TTL more, after which they count as a miss.
+RESULT_CACHE_PATH = os.path.join(CACHE_DIR, 'results.sqlite3')
+
+RESULT_TTL = 24 * 60 * 60            # Seconds a result is served as fresh
+STALE_TTL = 7 * 24 * 60 * 60         # Extra seconds a result may be served while refreshing
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Size cap for the whole cache file
+COMPRESS_MIN_BYTES = 1024            # Smaller payloads aren't worth compressing
+REFRESH_LEASE = 10 * 60              # Seconds one process may hold a refresh
+
+FRESH, STALE = 'fresh', 'stale'
+
+
+def make_key(domain, languages, model_versions):
+    """Builds the cache key for an analysis. Any model upgrade changes the key."""
+    key_data = json.dumps(
+        {'domain': domain.lower(), 'languages': sorted(languages), 'models': model_versions},
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+
+def _encode(value):
+    payload = json.dumps(value, ensure_ascii=False).encode('utf-8')
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        return zlib.compress(payload, 6), 1
+    return payload, 0
+
+
+def _decode(payload, compressed):
+    if compressed:
+        payload = zlib.decompress(payload)
+    return json.loads(payload.decode('utf-8'))
+
+
+class ResultCache(SQLiteStore):
+    """SQLite-backed result store with a TTL, stale-while-revalidate and a size cap."""
+
+    table = 'results'
+    columns = (
+        'key TEXT PRIMARY KEY, payload BLOB, compressed INTEGER, size INTEGER,'
+        ' created REAL, last_used REAL, refreshing_until REAL DEFAULT 0'
+    )
+    label = 'Result cache'
+
+    def __init__(self, path=RESULT_CACHE_PATH, ttl=RESULT_TTL, stale_ttl=STALE_TTL, max_bytes=MAX_CACHE_BYTES):
+        super().__init__(path, max_bytes)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def get(self, key):
+        """
+        Returns (results, status) where status is 'fresh' or 'stale',
+        or (None, None) on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None, None
+            try:
+                row = conn.execute(
+                    'SELECT payload, compressed, created FROM results WHERE key=?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None, None
+
+                payload, compressed, created = row
+                age = now - created
+                if age > self.ttl + self.stale_ttl:
+                    conn.execute('DELETE FROM results WHERE key=?', (key,))
+                    conn.commit()
+                    return None, None
+
+                conn.execute('UPDATE results SET last_used=? WHERE key=?', (now, key))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Result cache lookup failed: {e}")
+                return None, None
+
+        return _decode(payload, compressed), (FRESH if age <= self.ttl else STALE)
+
+    def put(self, key, results):
+        """Stores (or replaces) a finished analysis and releases any refresh lease."""
+        payload, compressed = _encode(results)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, 0)',
+                    (key, payload, compressed, len(payload), now, now),
+                )
+                conn.commit()
+                self._evict(conn)
+            except sqlite3.Error as e:
+                print(f"Warning: Result cache store failed: {e}")
+
+    def claim_refresh(self, key, lease=REFRESH_LEASE):
+        """
+        Atomically claims the right to recompute a stale entry, so only one
+        process in the fleet refreshes it. Returns True if this caller won.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return False
+            try:
+                cursor = conn.execute(
+                    'UPDATE results SET refreshing_until=? WHERE key=? AND refreshing_until < ?',
+                    (now + lease, key, now),
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+            except sqlite3.Error as e:
+                print(f"Warning: Result cache refresh claim failed: {e}")
+                return False
+
+    def release_refresh(self, key):
+        """Gives up a refresh lease without storing a new result (e.g. the refresh failed)."""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute('UPDATE results SET refreshing_until=0 WHERE key=?', (key,))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Result cache release failed: {e}")
+
+
+# Shared instance used by the dashboard and the server
+cache = ResultCache()
@@ -11,16 +11,69 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 # -----------------------------
 
+from core.browser_profile import LEAN_PROFILE, build_blocked_urls, should_block
+
 # Keywords to find policy pages
 POLICY_KEYWORDS = ['privacy', 'terms', 'policy', 'legal', 'conditions', 'cookie']
 
-def get_selenium_driver():
-    """Initializes and returns a headless Chrome driver."""
+# Profile used by find_policy_links / extract_text_from_url.
+# Set to None to load pages with a stock Chrome.
+BROWSER_PROFILE = LEAN_PROFILE
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+def install_request_blocking(driver, profile):
+    """
+    Drops requests the profile doesn't need. Uses BiDi request interception so
+    requests are matched on their real resource type; if that's unavailable,
+    falls back to blocking the profile's hosts with Network.setBlockedURLs.
+    """
+    def handle_request(request):
+        # Every intercepted request must be failed or continued, or the page stalls
+        try:
+            if should_block(profile, request.url, request.resource_type):
+                request.fail_request()
+            else:
+                request.continue_request()
+        except Exception as e:
+            print(f"Warning: Could not filter request {request.url}: {e}")
+
+    try:
+        driver.network.add_request_handler('before_request', handle_request)
+        return
+    except Exception as e:
+        print(f"Warning: Request interception unavailable, blocking hosts only: {e}")
+
+    blocked_urls = build_blocked_urls(profile)
+    if blocked_urls:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
+        except Exception as e:
+            # Blocking is an optimization only, the page still loads without it
+            print(f"Warning: Could not enable request blocking: {e}")
+
+def get_selenium_driver(profile=None):
+    """Initializes and returns a headless Chrome driver, optionally with a lean profile."""
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run in the background
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+
+    if profile:
+        if profile.get('disable_images'):
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        if profile.get('disable_extensions'):
+            chrome_options.add_argument("--disable-extensions")
+        if profile.get('js_heap_mb'):
+            chrome_options.add_argument(f"--js-flags=--max-old-space-size={profile['js_heap_mb']}")
+        if profile.get('block_resource_types') or profile.get('blocked_hosts'):
+            # WebDriver BiDi gives request interception with Chrome's resource types
+            chrome_options.enable_bidi = True
     
     # This will automatically download and manage the correct chromedriver
     service = ChromeService(ChromeDriverManager().install())
@@ -31,6 +84,9 @@ def get_selenium_driver():
         print(f"Error initializing Selenium driver: {e}")
         print("Please ensure Google Chrome is installed on your system.")
         return None
+
+    if profile:
+        install_request_blocking(driver, profile)
     return driver
 
 def score_link(href, text):
@@ -57,7 +113,7 @@ def find_policy_links(base_url):
     domain = urlparse(base_url).netloc
     
     print("Initializing Selenium driver...")
-    driver = get_selenium_driver()
+    driver = get_selenium_driver(BROWSER_PROFILE)
     if driver is None:
         return []
 
@@ -148,7 +204,7 @@ def find_policy_links(base_url):
 def extract_text_from_url(url):
     """Extracts text from a URL using Selenium."""
     print(f"Extracting text from {url} with Selenium...")
-    driver = get_selenium_driver()
+    driver = get_selenium_driver(BROWSER_PROFILE)
     if driver is None:
         return None, "Error: Could not start Selenium driver."
 
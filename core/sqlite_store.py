@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import threading
+
+# The translation memory and the result cache are both size-capped SQLite
+# files in CACHE_DIR, shared by every dashboard / server process on the machine.
+CACHE_DIR = os.environ.get(
+    'POLICYGUARD_CACHE_DIR', os.path.join(os.path.dirname(__file__), '..', 'cache')
+)
+EVICT_TO_FRACTION = 0.9              # Evict down to this fraction of the cap
+
+
+class SQLiteStore:
+    """
+    One SQLite table with a `size` and a `last_used` column, capped at max_bytes.
+    Subclasses set `table`, `columns` (the column definitions) and `label` (for warnings).
+    The total size lives in a one-row <table>_size table that triggers keep up
+    to date in the same transaction as each write, so eviction never scans the table.
+    """
+
+    table = None
+    columns = None
+    label = None
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._enabled = path is not None
+
+    def _connection(self):
+        """Opens the database lazily, and again after a fork (connections can't be shared)."""
+        if not self._enabled:
+            return None
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {self.table} ({self.columns})')
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_last_used ON {self.table} (last_used)')
+            self._create_size_counter(conn)
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: {self.label} disabled: {e}")
+            self._enabled = False
+            return None
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        return conn
+
+    def _create_size_counter(self, conn):
+        table, counter = self.table, f'{self.table}_size'
+        # Without this, INSERT OR REPLACE doesn't fire the delete trigger for the row it overwrites
+        conn.execute('PRAGMA recursive_triggers = ON')
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {counter} (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER)')
+        # A file written before the counter existed is counted once, here
+        conn.execute(f'INSERT OR IGNORE INTO {counter} VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM {table}))')
+        conn.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {counter}_insert AFTER INSERT ON {table} BEGIN'
+            f' UPDATE {counter} SET total = total + NEW.size WHERE id = 0; END'
+        )
+        conn.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {counter}_delete AFTER DELETE ON {table} BEGIN'
+            f' UPDATE {counter} SET total = total - OLD.size WHERE id = 0; END'
+        )
+        conn.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {counter}_update AFTER UPDATE OF size ON {table} BEGIN'
+            f' UPDATE {counter} SET total = total + NEW.size - OLD.size WHERE id = 0; END'
+        )
+
+    def _total_size(self, conn):
+        return conn.execute(f'SELECT total FROM {self.table}_size WHERE id = 0').fetchone()[0]
+
+    def disk_bytes(self):
+        """Returns the total size of the stored entries."""
+        with self._lock:
+            conn = self._connection()
+            return self._total_size(conn) if conn is not None else 0
+
+    def _evict(self, conn):
+        """Drops the least recently used entries once the table is over its size cap."""
+        total = self._total_size(conn)
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * EVICT_TO_FRACTION)
+        freed = 0
+        victims = []
+        for rowid, size in conn.execute(f'SELECT rowid, size FROM {self.table} ORDER BY last_used'):
+            victims.append((rowid,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany(f'DELETE FROM {self.table} WHERE rowid=?', victims)
+        conn.commit()
+
+    def clear(self):
+        """Deletes every entry."""
+        with self._lock:
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(f'DELETE FROM {self.table}')
+                conn.commit()
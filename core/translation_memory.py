@@ -0,0 +1,139 @@
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from core.sqlite_store import CACHE_DIR, SQLiteStore
+
+# Summaries of similar policies repeat a lot of the same sentences, so
+# translations are remembered per sentence. Lookups go through a small
+# in-process LRU first, then a size-bounded SQLite file shared by every
+# process on the machine.
+TM_PATH = os.path.join(CACHE_DIR, 'translation_memory.sqlite3')
+
+MEMORY_ENTRIES = 20000               # Sentences kept in the in-process LRU
+MAX_DISK_BYTES = 64 * 1024 * 1024    # Size cap for the on-disk tier
+
+
+def normalize_sentence(sentence):
+    """Normalizes a source sentence so trivially different copies share an entry."""
+    return re.sub(r'\s+', ' ', sentence).strip()
+
+
+def new_stats():
+    """Returns an empty stats dict, as filled in by lookups and stores."""
+    return {'hits': 0, 'misses': 0, 'time_saved_s': 0.0, 'translate_s': 0.0}
+
+
+def merge_stats(total, stats):
+    """Adds one stats dict into another and returns it."""
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def report(stats):
+    """Formats stats for the pipeline metrics, adding the hit rate."""
+    lookups = stats['hits'] + stats['misses']
+    return {
+        'hits': stats['hits'],
+        'misses': stats['misses'],
+        'hit_rate': stats['hits'] / lookups if lookups else 0.0,
+        'time_saved_s': round(stats['time_saved_s'], 3),
+        'translate_s': round(stats['translate_s'], 3),
+    }
+
+
+class TranslationMemory(SQLiteStore):
+    """
+    Sentence-level translation store keyed by (language, model id, normalized sentence).
+    Each entry also remembers how long it took to translate, which is what a hit saves.
+    """
+
+    table = 'tm'
+    columns = (
+        'language TEXT, model_id TEXT, source TEXT, translation TEXT,'
+        ' cost REAL, size INTEGER, last_used REAL,'
+        ' PRIMARY KEY (language, model_id, source)'
+    )
+    label = 'Translation memory disk tier'
+
+    def __init__(self, path=TM_PATH, memory_entries=MEMORY_ENTRIES, max_disk_bytes=MAX_DISK_BYTES):
+        super().__init__(path, max_disk_bytes)
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()  # key -> (translation, cost_s)
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, language, model_id, sentences, stats=None):
+        """Returns {normalized sentence: translation} for every sentence already known."""
+        found = {}
+        missing = []
+        with self._lock:
+            for sentence in dict.fromkeys(normalize_sentence(s) for s in sentences):
+                key = (language, model_id, sentence)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[sentence] = self._memory[key]
+                else:
+                    missing.append(sentence)
+
+            conn = self._connection()
+            if missing and conn is not None:
+                try:
+                    rows = []
+                    for sentence in missing:
+                        row = conn.execute(
+                            'SELECT translation, cost FROM tm WHERE language=? AND model_id=? AND source=?',
+                            (language, model_id, sentence),
+                        ).fetchone()
+                        if row:
+                            found[sentence] = (row[0], row[1])
+                            self._remember((language, model_id, sentence), found[sentence])
+                            rows.append((time.time(), language, model_id, sentence))
+                    if rows:
+                        conn.executemany(
+                            'UPDATE tm SET last_used=? WHERE language=? AND model_id=? AND source=?', rows
+                        )
+                        conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Warning: Translation memory lookup failed: {e}")
+
+        if stats is not None:
+            stats['hits'] += len(found)
+            stats['time_saved_s'] += sum(cost for _, cost in found.values())
+        return {sentence: translation for sentence, (translation, _) in found.items()}
+
+    def store(self, language, model_id, translations, cost_per_sentence=0.0):
+        """Saves {source sentence: translation} pairs to both tiers."""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for sentence, translation in translations.items():
+                sentence = normalize_sentence(sentence)
+                self._remember((language, model_id, sentence), (translation, cost_per_sentence))
+                size = len(sentence.encode('utf-8')) + len(translation.encode('utf-8'))
+                rows.append((language, model_id, sentence, translation, cost_per_sentence, size, now))
+
+            conn = self._connection()
+            if not rows or conn is None:
+                return
+            try:
+                conn.executemany('INSERT OR REPLACE INTO tm VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                conn.commit()
+                self._evict(conn)
+            except sqlite3.Error as e:
+                print(f"Warning: Translation memory store failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        super().clear()
+
+
+# Shared instance used by core.processor
+memory = TranslationMemory()
@@ -0,0 +1,295 @@
+"""
+Pre-fork JSON API server for PolicyGuard.
+
+The parent process loads every model once, freezes them, and then forks
+worker processes that share the model weights copy-on-write. The parent
+only supervises: it restarts workers that exit and periodically reports
+how much memory each worker holds on its own (USS).
+
+Usage:
+    python server.py --workers 4 --port 8600
+
+Endpoints:
+    POST /analyze   {"domain": "example.com", "languages": ["bengali", "french"]}
+    GET  /memory    Per-process RSS / PSS / USS for the parent and all workers
+    GET  /health
+"""
+import argparse
+import gc
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Objects created while loading the models are never garbage, so keep the
+# collector from touching (and so dirtying) their pages. gc.freeze() below
+# moves them out of its reach for good before the fork.
+gc.disable()
+
+import torch
+import core.analyzer as analyzer
+import core.processor as processor
+import core.pipeline as pipeline
+from core.procstats import child_pids, read_memory, format_bytes
+
+# Workers that exit faster than this are restarted with a delay, so a
+# crash on startup doesn't turn into a fork loop
+MIN_WORKER_LIFETIME = 5
+RESTART_DELAY = 2
+
+
+def freeze_models():
+    """
+    Puts every model into a read-only inference state before forking.
+    Anything that would write into weight pages (autograd state, lazily
+    built caches) has to happen here, in the parent, or the pages get copied.
+    """
+    torch.set_grad_enabled(False)
+    if processor.MODELS_LOADED:
+        hf_pipelines = [processor.summarizer] + list(processor.TRANSLATORS.values())
+        for hf_pipeline in hf_pipelines:
+            hf_pipeline.model.eval()
+            for param in hf_pipeline.model.parameters():
+                param.requires_grad_(False)
+
+    # Move everything allocated so far into the permanent generation
+    gc.collect()
+    gc.freeze()
+
+
+def to_json_results(results):
+    """Drops the fields that are only needed by the dashboard."""
+    return {key: value for key, value in results.items() if key != 'full_text'}
+
+
+def memory_report(parent_pid, workers):
+    """Returns per-process memory for the parent and the given worker pids."""
+    report = {'parent': dict(read_memory(parent_pid), pid=parent_pid), 'workers': []}
+    for pid in workers:
+        report['workers'].append(dict(read_memory(pid), pid=pid))
+    return report
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'pid': os.getpid()})
+        elif self.path == '/memory':
+            # The workers are the parent's only direct children (Chrome runs below them)
+            parent = os.getppid()
+            self._send_json(200, memory_report(parent, child_pids(parent)))
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/analyze':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': 'Expected a JSON body'})
+            return
+
+        domain = request.get('domain') if isinstance(request, dict) else None
+        if not isinstance(domain, str) or not domain.strip():
+            self._send_json(400, {'error': 'Expected a JSON object with a "domain" string'})
+            return
+
+        languages = request.get('languages', ['bengali'])
+        if not isinstance(languages, list) or not all(isinstance(lang, str) for lang in languages):
+            self._send_json(400, {'error': '"languages" must be a list of strings'})
+            return
+        languages = [lang.lower() for lang in languages]
+
+        try:
+            results, error = pipeline.analyze_domain_cached(domain, languages)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+
+        if results is None:
+            self._send_json(422, {'error': error})
+        else:
+            self._send_json(200, to_json_results(results))
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[worker {os.getpid()}] {format % args}\n")
+
+
+class WorkerHTTPServer(HTTPServer):
+    """HTTPServer that counts the requests it handles, so the worker can tell them from poll timeouts."""
+
+    # handle_request() returns after this many seconds without a connection,
+    # so an idle worker notices SIGTERM
+    timeout = 1
+    handled = 0
+
+    def process_request(self, request, client_address):
+        try:
+            super().process_request(request, client_address)
+        finally:
+            self.handled += 1
+
+
+def run_worker(listen_socket, threads_per_worker, max_requests):
+    """Worker main loop. Never returns."""
+    # SIGTERM only stops the loop, so a request in progress (and any browser it
+    # started) finishes and cleans up before the worker exits
+    stopping = False
+
+    def stop(*args):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent handles Ctrl+C
+    gc.enable()
+    torch.set_num_threads(threads_per_worker)
+
+    server = WorkerHTTPServer(listen_socket.getsockname(), AnalysisHandler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = listen_socket
+
+    try:
+        while not stopping and (max_requests == 0 or server.handled < max_requests):
+            server.handle_request()
+    finally:
+        # Exit without running the parent's atexit handlers or flushing its buffers twice
+        os._exit(0)
+
+
+class Supervisor:
+    """Forks the workers, restarts them when they exit and logs their memory use."""
+
+    def __init__(self, listen_socket, workers, threads_per_worker, max_requests, report_interval):
+        self.listen_socket = listen_socket
+        self.num_workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.max_requests = max_requests
+        self.report_interval = report_interval
+        self.workers = {}  # pid -> start time
+        self.running = True
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.listen_socket, self.threads_per_worker, self.max_requests)
+        self.workers[pid] = time.monotonic()
+        print(f"Started worker {pid}")
+
+    def stop(self, *args):
+        self.running = False
+
+    def reap(self):
+        """Collects exited workers and returns how many need replacing."""
+        replace = 0
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self.workers.pop(pid, None)
+            if started is None:
+                continue
+            lifetime = time.monotonic() - started
+            print(f"Worker {pid} exited with status {status} after {lifetime:.0f}s")
+            if lifetime < MIN_WORKER_LIFETIME:
+                time.sleep(RESTART_DELAY)
+            replace += 1
+        return replace
+
+    def log_memory(self):
+        report = memory_report(os.getpid(), list(self.workers))
+        parent = report['parent']
+        print(f"Memory: parent rss={format_bytes(parent['rss'])} uss={format_bytes(parent['uss'])}")
+        for worker in report['workers']:
+            print(f"  worker {worker['pid']}: rss={format_bytes(worker['rss'])} "
+                  f"pss={format_bytes(worker['pss'])} uss={format_bytes(worker['uss'])}")
+        if report['workers']:
+            total_uss = sum(w['uss'] for w in report['workers'])
+            total_pss = parent['pss'] + sum(w['pss'] for w in report['workers'])
+            print(f"  total pss={format_bytes(total_pss)}, "
+                  f"mean worker uss={format_bytes(total_uss / len(report['workers']))}")
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(self.num_workers):
+            self.spawn()
+
+        last_report = time.monotonic()
+        while self.running:
+            for _ in range(self.reap()):
+                if self.running:
+                    self.spawn()
+            if self.report_interval and time.monotonic() - last_report >= self.report_interval:
+                self.log_memory()
+                last_report = time.monotonic()
+            time.sleep(0.5)
+
+        print("Shutting down workers...")
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.workers):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork PolicyGuard analysis server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--workers', type=int, default=2, help='number of worker processes')
+    parser.add_argument('--max-requests', type=int, default=0,
+                        help='recycle a worker after this many requests (0 = never)')
+    parser.add_argument('--report-interval', type=float, default=60,
+                        help='seconds between memory reports (0 = off)')
+    args = parser.parse_args()
+
+    if not processor.MODELS_LOADED or not analyzer.MODELS_LOADED:
+        print("Warning: Some models failed to load, workers will return errors for those stages.")
+
+    freeze_models()
+    # Only the frozen objects needed to be kept from the collector; the
+    # supervisor itself runs for a long time and needs cycle collection
+    gc.enable()
+
+    listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listen_socket.bind((args.host, args.port))
+    listen_socket.listen(128)
+
+    # Split the cores between the workers so torch doesn't oversubscribe them
+    threads_per_worker = max(1, (os.cpu_count() or 1) // args.workers)
+
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers "
+          f"({threads_per_worker} torch threads each)")
+    Supervisor(listen_socket, args.workers, threads_per_worker,
+               args.max_requests, args.report_interval).run()
+    listen_socket.close()
+
+
+if __name__ == "__main__":
+    main()
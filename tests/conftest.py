@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Lets the tests import `core` however pytest is started
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,32 @@
+from core.browser_profile import LEAN_PROFILE, build_blocked_urls, is_blocked_host, should_block
+
+
+def test_documents_are_never_blocked_by_type():
+    profile = dict(LEAN_PROFILE, block_resource_types=['image', 'document'])
+    for url in ['https://www.movistar.es/', 'https://www.giffgaff.com/privacy', 'https://icons.example/terms.ico']:
+        assert not should_block(profile, url, 'Document')
+
+
+def test_blocks_configured_resource_types_whatever_the_url():
+    assert should_block(LEAN_PROFILE, 'https://example.com/logo', 'Image')
+    assert should_block(LEAN_PROFILE, 'https://example.com/a.woff2?v=3', 'Font')
+    assert should_block(LEAN_PROFILE, 'https://example.com/clip', 'Media')
+    assert not should_block(LEAN_PROFILE, 'https://example.com/app.js', 'Script')
+    assert not should_block(LEAN_PROFILE, 'https://example.com/photo.jpg', None)
+
+
+def test_blocked_hosts_match_subdomains_and_ports():
+    profile = {'blocked_hosts': ['doubleclick.net', 'localhost']}
+    assert is_blocked_host(profile, 'https://doubleclick.net/x')
+    assert is_blocked_host(profile, 'https://ad.doubleclick.net/x')
+    assert is_blocked_host(profile, 'http://localhost:8123/ads/track.js')
+    assert not is_blocked_host(profile, 'https://notdoubleclick.net/x')
+    assert not is_blocked_host(profile, 'https://example.com/?ref=doubleclick.net')
+    # A blocked host's frames are documents too, and still blocked
+    assert should_block(profile, 'http://localhost:8123/ads/frame.html', 'Document')
+
+
+def test_blocked_url_patterns_cover_hosts_with_ports_only():
+    patterns = build_blocked_urls({'blocked_hosts': ['localhost'], 'block_resource_types': ['image']})
+    assert patterns == ['*://localhost/*', '*://localhost:*/*', '*://*.localhost/*', '*://*.localhost:*/*']
+    assert build_blocked_urls({'block_resource_types': ['image', 'media']}) == []
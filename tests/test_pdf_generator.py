@@ -0,0 +1,85 @@
+import copy
+
+import pytest
+
+import core.pdf_generator as pdf_generator
+
+
+@pytest.fixture(autouse=True)
+def empty_report_cache():
+    pdf_generator._report_cache.clear()
+    yield
+    pdf_generator._report_cache.clear()
+
+
+def make_results(**overrides):
+    results = {
+        'url': 'https://example.com/privacy',
+        'overall_risk': 'High Risk',
+        'summary': 'We share your data with partners.',
+        'language': 'bengali',
+        'translated_summary': 'আমরা আপনার তথ্য শেয়ার করি।',
+        'translations': {'bengali': 'আমরা আপনার তথ্য শেয়ার করি।', 'french': 'Nous partageons vos données.'},
+        'highlights': ['[HIGH RISK] We sell your data to third parties for advertising.'],
+        'full_text': 'We sell your data to third parties for advertising. We keep it for as long as we like.',
+        'metrics': {'result_cache': 'fresh'},
+    }
+    results.update(overrides)
+    return results
+
+
+def record_sections(monkeypatch):
+    titles = []
+    add_section = pdf_generator.PDF.add_section
+
+    def recording_add_section(self, title, content):
+        titles.append(title)
+        add_section(self, title, content)
+
+    monkeypatch.setattr(pdf_generator.PDF, 'add_section', recording_add_section)
+    return titles
+
+
+def test_create_report_does_not_modify_its_input():
+    results = make_results()
+    before = copy.deepcopy(results)
+    assert pdf_generator.create_report(results).startswith(b'%PDF')
+    assert results == before
+
+
+def test_identical_results_hit_the_cache():
+    first = pdf_generator.create_report(make_results())
+    # Fields that don't end up in the PDF don't change the key
+    assert pdf_generator.create_report(make_results(metrics={'result_cache': 'stale'})) is first
+    assert pdf_generator.create_report(make_results(summary='Something else.')) is not first
+
+
+def test_report_key_follows_the_rendered_content():
+    key = pdf_generator.report_key(make_results())
+    assert pdf_generator.report_key(make_results(translations={'bengali': 'অন্য'})) != key
+    # full_text only matters through the chart's risk counts
+    assert pdf_generator.report_key(make_results(full_text='Too short.')) != key
+    assert pdf_generator.report_key(make_results(metrics={})) == key
+
+
+def test_one_section_per_language(monkeypatch):
+    titles = record_sections(monkeypatch)
+    pdf_generator.render_report(make_results())
+    assert titles == [
+        'Easy-to-Read Summary (English)', 'Summary (Bengali)', 'Summary (French)', 'Key Highlights & Risks',
+    ]
+
+
+def test_single_language_results_still_get_a_translated_section(monkeypatch):
+    titles = record_sections(monkeypatch)
+    results = make_results()
+    del results['translations']
+    pdf_generator.render_report(results)
+    assert 'Summary (Bengali)' in titles
+
+
+def test_report_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(pdf_generator, 'MAX_CACHED_REPORTS', 2)
+    for i in range(4):
+        pdf_generator.create_report(make_results(url=f"https://example{i}.com/privacy"))
+    assert len(pdf_generator._report_cache) == 2
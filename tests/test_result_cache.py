@@ -0,0 +1,44 @@
+import os
+
+from core.result_cache import FRESH, STALE, ResultCache, make_key
+
+
+def test_key_ignores_domain_case_and_language_order():
+    models = {'classifier': 'abc'}
+    assert make_key('Example.com', ['hindi', 'bengali'], models) == make_key('example.com', ['bengali', 'hindi'], models)
+    assert make_key('example.com', ['bengali'], models) != make_key('example.com', ['bengali'], {'classifier': 'def'})
+
+
+def test_round_trip_small_and_compressed(tmp_path):
+    cache = ResultCache(path=os.path.join(tmp_path, 'results.sqlite3'))
+    small = {'summary': 'short'}
+    large = {'summary': 'policy text ' * 1000, 'translations': {'bengali': 'অনুবাদ ' * 500}}
+    cache.put('small', small)
+    cache.put('large', large)
+    assert cache.get('small') == (small, FRESH)
+    assert cache.get('large') == (large, FRESH)
+    assert cache.get('missing') == (None, None)
+
+
+def test_stale_then_expired(tmp_path, monkeypatch):
+    cache = ResultCache(path=os.path.join(tmp_path, 'results.sqlite3'), ttl=10, stale_ttl=20)
+    now = [1000.0]
+    monkeypatch.setattr('core.result_cache.time.time', lambda: now[0])
+    cache.put('key', {'summary': 'x'})
+
+    now[0] += 15
+    assert cache.get('key') == ({'summary': 'x'}, STALE)
+    now[0] += 20
+    assert cache.get('key') == (None, None)
+    assert cache.disk_bytes() == 0
+
+
+def test_only_one_refresh_claim_per_lease(tmp_path):
+    cache = ResultCache(path=os.path.join(tmp_path, 'results.sqlite3'))
+    cache.put('key', {'summary': 'x'})
+    assert cache.claim_refresh('key')
+    assert not cache.claim_refresh('key')
+    cache.release_refresh('key')
+    assert cache.claim_refresh('key')
+    cache.put('key', {'summary': 'y'})  # A new result releases the lease
+    assert cache.claim_refresh('key')
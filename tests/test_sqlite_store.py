@@ -0,0 +1,59 @@
+import os
+import sqlite3
+
+import pytest
+
+from core.result_cache import ResultCache
+from core.translation_memory import TranslationMemory
+
+
+def write_translation(store, i):
+    store.store('french', 'm', {f"Sentence number {i % 60}.": 'x' * (i % 40 + 1)})
+
+
+def write_result(store, i):
+    store.put(f"key{i % 15}", {'summary': 'y' * (i % 40 * 5 + 1)})
+
+
+# (store class, how to write the i-th entry)
+STORES = [
+    pytest.param(TranslationMemory, write_translation, id='translation_memory'),
+    pytest.param(ResultCache, write_result, id='result_cache'),
+]
+
+
+def open_store(cls, tmp_path, max_bytes=1024 * 1024):
+    store = cls(os.path.join(tmp_path, 'store.sqlite3'))
+    store.max_bytes = max_bytes
+    return store
+
+
+@pytest.mark.parametrize('cls, write', STORES)
+def test_size_counter_tracks_replacements_and_eviction(tmp_path, cls, write):
+    store = open_store(cls, tmp_path, max_bytes=2000)
+    conn = store._connection()
+    for i in range(200):
+        write(store, i)
+        stored = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {store.table}').fetchone()[0]
+        assert store.disk_bytes() == stored
+        assert stored <= 2000
+    store.clear()
+    assert store.disk_bytes() == 0
+
+
+@pytest.mark.parametrize('cls, write', STORES)
+def test_size_counter_counts_an_existing_database(tmp_path, cls, write):
+    path = os.path.join(tmp_path, 'store.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute(f'CREATE TABLE {cls.table} ({cls.columns})')
+    conn.execute(f'INSERT INTO {cls.table} (size, last_used) VALUES (14, 0)')
+    conn.commit()
+    conn.close()
+    assert cls(path).disk_bytes() == 14
+
+
+@pytest.mark.parametrize('cls, write', STORES)
+def test_disabled_without_a_path(cls, write):
+    store = cls(None)
+    write(store, 0)
+    assert store.disk_bytes() == 0
@@ -0,0 +1,38 @@
+import os
+
+from core.translation_memory import TranslationMemory, new_stats, normalize_sentence, report
+
+
+def test_normalize_collapses_whitespace():
+    assert normalize_sentence('  We   share\n your data. ') == 'We share your data.'
+
+
+def test_lookup_hits_are_keyed_by_language_and_model(tmp_path):
+    memory = TranslationMemory(path=os.path.join(tmp_path, 'tm.sqlite3'))
+    memory.store('bengali', 'model@1', {'We share  your data.': 'আমরা শেয়ার করি।'}, cost_per_sentence=0.5)
+
+    stats = new_stats()
+    found = memory.lookup('bengali', 'model@1', ['We share your data.', 'Unknown sentence.'], stats)
+    assert found == {'We share your data.': 'আমরা শেয়ার করি।'}
+    assert stats['hits'] == 1 and stats['time_saved_s'] == 0.5
+    assert memory.lookup('bengali', 'model@2', ['We share your data.']) == {}
+    assert memory.lookup('hindi', 'model@1', ['We share your data.']) == {}
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    path = os.path.join(tmp_path, 'tm.sqlite3')
+    TranslationMemory(path=path).store('french', 'm', {'Hello.': 'Bonjour.'})
+    assert TranslationMemory(path=path).lookup('french', 'm', ['Hello.']) == {'Hello.': 'Bonjour.'}
+
+
+def test_in_process_lru_is_bounded():
+    memory = TranslationMemory(path=None, memory_entries=3)
+    memory.store('french', 'm', {f"Sentence {i}.": f"Phrase {i}." for i in range(10)})
+    assert len(memory._memory) == 3
+    assert memory.lookup('french', 'm', ['Sentence 9.', 'Sentence 0.']) == {'Sentence 9.': 'Phrase 9.'}
+
+
+def test_report_adds_hit_rate():
+    stats = dict(new_stats(), hits=3, misses=1)
+    assert report(stats)['hit_rate'] == 0.75
+    assert report(new_stats())['hit_rate'] == 0.0